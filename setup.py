@@ -4,7 +4,14 @@ setup(
     name="survey-exporter",
     version="0.1.0",
     packages=find_packages(),
-    install_requires=["requests>=2.25.0", "urllib3>=1.26.0"],
+    install_requires=[
+        "requests>=2.25.0",
+        "urllib3>=1.26.0",
+        "orjson>=3.6.0",
+    ],
+    extras_require={
+        "async": ["aiohttp>=3.8.0"],
+    },
     entry_points={
         "console_scripts": [
             "survey-gui=survey_exporter.survey_gui:main",
@@ -22,8 +29,8 @@ setup(
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.10",
 )
@@ -1,12 +1,44 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
+import collections
 import pathlib
-import queue
 import threading
 from survey_exporter.main import build_survey_responses_html, use_out_queue
 
 
+class _NotifyingLog:
+    """Bounded log buffer that pings the Tk event loop on every append.
+
+    put() is called from the export worker thread (via emit()). deque append
+    and popleft are atomic under the GIL, so no lock is taken per line, and
+    event_generate is safe to call from other threads. The deque's maxlen
+    drops the oldest pending line if the worker outruns the GUI, keeping
+    memory flat and the newest output on screen.
+    """
+
+    MAX_PENDING = 10_000
+
+    def __init__(self, root):
+        self._root = root
+        self._log = collections.deque(maxlen=self.MAX_PENDING)
+
+    def put(self, item):
+        self._log.append(item)
+        try:
+            self._root.event_generate("<<LogReady>>", when="tail")
+        except tk.TclError:
+            # window is being torn down; the item stays queued harmlessly
+            pass
+
+    def popleft(self):
+        return self._log.popleft()
+
+
 class SurveyExporterGUI:
+    # oldest console lines are dropped past this point so memory and Text
+    # widget redraw cost stay bounded on long exports
+    MAX_CONSOLE_LINES = 5000
+
     def __init__(self, root):
         self.root = root
         root.title("Survey Exporter")
@@ -32,27 +64,42 @@ class SurveyExporterGUI:
         tk.Label(root, text="Output:").pack(pady=5)
         self.console = scrolledtext.ScrolledText(root, height=10, width=60)
         self.console.pack(pady=5, padx=5, fill=tk.BOTH, expand=True)
+        # bound methods cached once; _drain_queue runs per log burst and the
+        # dotted lookups are measurable overhead on chatty exports
+        self._console_insert = self.console.insert
+        self._console_see = self.console.see
 
         # Export Button
         tk.Button(root, text="Export Survey", command=self.export_survey).pack(pady=20)
 
-        # Setup stdout redirection
-        self.output_queue = queue.Queue()
-
-        # Start output monitoring
-        self.monitor_output()
-
-    def monitor_output(self):
-        """Check queue for new output and display it"""
-        while True:
-            try:
-                text = self.output_queue.get_nowait()
-                self.console.insert(tk.END, text + "\n")
-                self.console.see(tk.END)
-                self.console.update_idletasks()
-            except queue.Empty:
-                break
-        self.root.after(100, self.monitor_output)
+        # Worker threads enqueue output here; each put fires <<LogReady>> so
+        # the console updates as soon as there is something to show
+        self.output_queue = _NotifyingLog(root)
+        root.bind("<<LogReady>>", self._drain_queue)
+
+        # low-frequency safety net in case an event is lost mid-shutdown
+        self.root.after(500, self._poll)
+
+    def _drain_queue(self, event=None):
+        """Display any queued output in the console in one batched insert."""
+        parts = []
+        try:
+            while True:
+                parts.append(self.output_queue.popleft() + "\n")
+        except IndexError:
+            pass
+        if parts:
+            # one insert/see per burst amortizes Tk's layout and redraw work;
+            # the normal idle cycle repaints, no forced update needed
+            self._console_insert(tk.END, "".join(parts))
+            lines = int(self.console.index("end-1c").split(".")[0])
+            if lines > self.MAX_CONSOLE_LINES:
+                self.console.delete("1.0", f"{lines - self.MAX_CONSOLE_LINES}.0")
+            self._console_see(tk.END)
+
+    def _poll(self):
+        self._drain_queue()
+        self.root.after(500, self._poll)
 
     def browse_directory(self):
         dir_path = filedialog.askdirectory()
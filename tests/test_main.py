@@ -1,12 +1,14 @@
+import json
 import pathlib
+import queue
 import pytest
 from unittest.mock import patch, MagicMock
 from survey_exporter.main import (
     build_survey_responses_html,
     get_entries,
     http_get_head_or_download,
+    use_out_queue,
 )
-import json
 
 
 @pytest.fixture
@@ -38,15 +40,21 @@ def mock_api_response():
     }
 
 
+def make_json_response(payload):
+    """Build a mock requests response whose .json() returns the given payload."""
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = payload
+    resp.content = json.dumps(payload).encode()
+    resp.headers = {}
+    return resp
+
+
 def test_get_entries_populates_entry_fields(mock_api_response):
     """Test that Entry objects are populated with correct values."""
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.__enter__.return_value.read.return_value = json.dumps(
-            mock_api_response
-        ).encode()
-        mock_urlopen.return_value = mock_response
-
+    with patch(
+        "requests.Session.get", return_value=make_json_response(mock_api_response)
+    ):
         entries = get_entries(
             api_key="test_key",
             survey_id="survey_123",
@@ -90,13 +98,7 @@ def test_get_entries_cleans_media_urls_with_private_suffix():
             }
         ]
     }
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.__enter__.return_value.read.return_value = json.dumps(
-            response
-        ).encode()
-        mock_urlopen.return_value = mock_response
-
+    with patch("requests.Session.get", return_value=make_json_response(response)):
         entries = get_entries(
             api_key="test_key",
             survey_id="survey_123",
@@ -129,13 +131,7 @@ def test_get_entries_cleans_media_urls_without_private_suffix():
             }
         ]
     }
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.__enter__.return_value.read.return_value = json.dumps(
-            response
-        ).encode()
-        mock_urlopen.return_value = mock_response
-
+    with patch("requests.Session.get", return_value=make_json_response(response)):
         entries = get_entries(
             api_key="test_key",
             survey_id="survey_123",
@@ -157,13 +153,7 @@ def test_get_entries_handles_missing_fields():
     """Test that get_entries handles missing fields gracefully."""
     response = {"data": [{"data": {"breach_123": []}}]}
 
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.__enter__.return_value.read.return_value = json.dumps(
-            response
-        ).encode()
-        mock_urlopen.return_value = mock_response
-
+    with patch("requests.Session.get", return_value=make_json_response(response)):
         entries = get_entries(
             api_key="test_key",
             survey_id="survey_123",
@@ -198,13 +188,7 @@ def test_get_entries_handles_single_media_url():
             }
         ]
     }
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.__enter__.return_value.read.return_value = json.dumps(
-            response
-        ).encode()
-        mock_urlopen.return_value = mock_response
-
+    with patch("requests.Session.get", return_value=make_json_response(response)):
         entries = get_entries(
             api_key="test_key",
             survey_id="survey_123",
@@ -226,13 +210,7 @@ def test_get_entries_returns_empty_list_on_invalid_response():
     """Test that get_entries returns empty list if response data is not a list."""
     response = {"data": "invalid"}
 
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.__enter__.return_value.read.return_value = json.dumps(
-            response
-        ).encode()
-        mock_urlopen.return_value = mock_response
-
+    with patch("requests.Session.get", return_value=make_json_response(response)):
         entries = get_entries(
             api_key="test_key",
             survey_id="survey_123",
@@ -248,8 +226,8 @@ def test_get_entries_returns_empty_list_on_invalid_response():
 
 def test_get_entries_raises_on_http_error():
     """If the HTTP/JSON fetch fails, get_entries should raise a RuntimeError with a message."""
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_urlopen.side_effect = Exception("network failure")
+    with patch("requests.Session.get") as mock_get:
+        mock_get.side_effect = Exception("network failure")
 
         with pytest.raises(RuntimeError) as excinfo:
             get_entries(
@@ -283,13 +261,7 @@ def test_get_entries_raises_on_duplicate_media_suffix():
         ]
     }
 
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.__enter__.return_value.read.return_value = json.dumps(
-            response
-        ).encode()
-        mock_urlopen.return_value = mock_response
-
+    with patch("requests.Session.get", return_value=make_json_response(response)):
         with pytest.raises(ValueError) as excinfo:
             get_entries(
                 api_key="test_key",
@@ -309,15 +281,50 @@ def test_get_entries_raises_on_duplicate_media_suffix():
         assert "naming conflict" in error_msg
 
 
-def make_filelike_with_read(content):
-    m = MagicMock()
-    # json.load expects a text file-like (returning str)
-    m.read.return_value = content
-    return m
+def test_get_entries_reuses_cached_payload_on_304(tmp_path):
+    """A 304 Not Modified response should be answered from the on-disk cache."""
+    response = {
+        "data": [
+            {
+                "data": {
+                    "breach_123": ["Breach A"],
+                    "date_456": "2025-11-15",
+                    "time_789": "14:30",
+                    "media_101": [],
+                    "comment_202": "",
+                }
+            }
+        ]
+    }
+    resp_200 = make_json_response(response)
+    resp_200.headers = {"ETag": '"abc123"'}
+    resp_304 = MagicMock()
+    resp_304.status_code = 304
+
+    kwargs = dict(
+        api_key="test_key",
+        survey_id="survey_123",
+        breaches_id="breach_123",
+        date_id="date_456",
+        time_id="time_789",
+        media_url_id="media_101",
+        comment_id="comment_202",
+        cache_dir=tmp_path,
+    )
+    with patch("requests.Session.get", side_effect=[resp_200, resp_304]) as mock_get:
+        first = get_entries(**kwargs)
+        second = get_entries(**kwargs)
+
+    assert first == second
+    assert first[0].date == "2025-11-15"
+    # second request must have revalidated with the stored ETag
+    assert mock_get.call_args_list[1][1]["headers"]["If-None-Match"] == '"abc123"'
 
 
 def test_build_survey_responses_html_downloads_media(tmp_path):
     """Test that build_survey_responses_html downloads media files to output_dir/media."""
+    # the concurrent download path only runs with the optional 'async' extra
+    pytest.importorskip("aiohttp")
     api_payload = {
         "data": [
             {
@@ -335,24 +342,23 @@ def test_build_survey_responses_html_downloads_media(tmp_path):
         ]
     }
 
-    # prepare the sequence of urlopen returns:
-    # 1) JSON response (returning str)
-    # 2) download file1.jpg (returning bytes)
-    # 3) download doc.pdf (returning bytes)
-    json_filelike = make_filelike_with_read(json.dumps(api_payload))
-    file1_bytes = make_filelike_with_read(b"file1-binary")
-    file2_bytes = make_filelike_with_read(b"file2-binary")
-
-    ctx_json = MagicMock()
-    ctx_json.__enter__.return_value = json_filelike
-    ctx_file1 = MagicMock()
-    ctx_file1.__enter__.return_value = file1_bytes
-    ctx_file2 = MagicMock()
-    ctx_file2.__enter__.return_value = file2_bytes
+    contents = {
+        "https://example.com/private/file1.jpg": b"file1-binary",
+        "https://example.com/uploads/doc%202.pdf": b"file2-binary",
+    }
 
-    with patch(
-        "urllib.request.urlopen", side_effect=[ctx_json, ctx_file1, ctx_file2]
-    ) as mock_urlopen:
+    async def fake_download_all(pairs, headers):
+        for url, target_path in pairs:
+            target_path = pathlib.Path(target_path)
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            target_path.write_bytes(contents[url])
+
+    with (
+        patch("requests.Session.get", return_value=make_json_response(api_payload)),
+        patch(
+            "survey_exporter.main._download_all", side_effect=fake_download_all
+        ) as mock_download,
+    ):
         out = build_survey_responses_html(
             api_key="test_key",
             output_dir=pathlib.Path(tmp_path),
@@ -364,8 +370,10 @@ def test_build_survey_responses_html_downloads_media(tmp_path):
             comment_id="comment_202",
         )
 
-        # expect two downloads + one json fetch -> 3 calls
-        assert mock_urlopen.call_count == 3
+        # one concurrent batch download covering both URLs
+        assert mock_download.call_count == 1
+        pairs = mock_download.call_args[0][0]
+        assert [url for url, _ in pairs] == list(contents)
 
         media_dir = pathlib.Path(tmp_path) / "media"
         file1_path = media_dir / "file1.jpg"
@@ -384,12 +392,251 @@ def test_build_survey_responses_html_downloads_media(tmp_path):
         assert "doc%202.pdf" in html_text
 
 
+def test_build_survey_responses_html_skips_colliding_target_paths(tmp_path):
+    """Two URLs that sanitize to the same filename must yield one download."""
+    # the concurrent download path only runs with the optional 'async' extra
+    pytest.importorskip("aiohttp")
+    api_payload = {
+        "data": [
+            {
+                "data": {
+                    "breach_123": ["Breach A"],
+                    "date_456": "2025-11-15",
+                    "time_789": "14:30",
+                    "media_101": [
+                        "https://example.com/private/a/photo.jpg",
+                        "https://example.com/private/b/photo.jpg",
+                    ],
+                    "comment_202": "",
+                }
+            }
+        ]
+    }
+
+    async def fake_download_all(pairs, headers):
+        for _url, target_path in pairs:
+            target_path = pathlib.Path(target_path)
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            target_path.write_bytes(b"photo-binary")
+
+    log = queue.Queue()
+    with (
+        patch("requests.Session.get", return_value=make_json_response(api_payload)),
+        patch(
+            "survey_exporter.main._download_all", side_effect=fake_download_all
+        ) as mock_download,
+    ):
+        with use_out_queue(log):
+            build_survey_responses_html(
+                api_key="test_key",
+                output_dir=pathlib.Path(tmp_path),
+                survey_id="survey_123",
+                breaches_id="breach_123",
+                date_id="date_456",
+                time_id="time_789",
+                media_url_id="media_101",
+                comment_id="comment_202",
+            )
+
+    # only the first URL claims media/photo.jpg; the second is skipped
+    pairs = mock_download.call_args[0][0]
+    assert [url for url, _ in pairs] == ["https://example.com/private/a/photo.jpg"]
+
+    # the skip message names the losing URL so the conflict is diagnosable
+    messages = []
+    while not log.empty():
+        messages.append(log.get_nowait())
+    assert any(
+        msg.startswith(
+            "Skipping https://example.com/private/b/photo.jpg: filename already claimed"
+        )
+        for msg in messages
+    )
+
+
+def test_build_survey_responses_html_falls_back_to_threads_without_aiohttp(tmp_path):
+    """Without aiohttp, downloads should go through http_get_head_or_download."""
+    api_payload = {
+        "data": [
+            {
+                "data": {
+                    "breach_123": ["Breach A"],
+                    "date_456": "2025-11-15",
+                    "time_789": "14:30",
+                    "media_101": ["https://example.com/private/file1.jpg"],
+                    "comment_202": "",
+                }
+            }
+        ]
+    }
+
+    with (
+        patch("requests.Session.get", return_value=make_json_response(api_payload)),
+        patch("survey_exporter.main.aiohttp", None),
+        patch(
+            "survey_exporter.main.http_get_head_or_download", return_value=True
+        ) as mock_download,
+    ):
+        build_survey_responses_html(
+            api_key="test_key",
+            output_dir=pathlib.Path(tmp_path),
+            survey_id="survey_123",
+            breaches_id="breach_123",
+            date_id="date_456",
+            time_id="time_789",
+            media_url_id="media_101",
+            comment_id="comment_202",
+        )
+
+    assert mock_download.call_count == 1
+    url, _headers, target = mock_download.call_args[0]
+    assert url == "https://example.com/private/file1.jpg"
+    assert target.endswith("file1.jpg")
+
+
+def test_thread_fallback_warns_on_failed_download(tmp_path):
+    """A False result from http_get_head_or_download should surface as a warning."""
+    api_payload = {
+        "data": [
+            {
+                "data": {
+                    "breach_123": ["Breach A"],
+                    "date_456": "2025-11-15",
+                    "time_789": "14:30",
+                    "media_101": ["https://example.com/private/file1.jpg"],
+                    "comment_202": "",
+                }
+            }
+        ]
+    }
+
+    log = queue.Queue()
+    with (
+        patch("requests.Session.get", return_value=make_json_response(api_payload)),
+        patch("survey_exporter.main.aiohttp", None),
+        patch("survey_exporter.main.http_get_head_or_download", return_value=False),
+    ):
+        with use_out_queue(log):
+            build_survey_responses_html(
+                api_key="test_key",
+                output_dir=pathlib.Path(tmp_path),
+                survey_id="survey_123",
+                breaches_id="breach_123",
+                date_id="date_456",
+                time_id="time_789",
+                media_url_id="media_101",
+                comment_id="comment_202",
+            )
+
+    messages = []
+    while not log.empty():
+        messages.append(log.get_nowait())
+    assert any(
+        msg.startswith(
+            "Warning: Failed to download https://example.com/private/file1.jpg"
+        )
+        for msg in messages
+    )
+
+
+def make_stream_response(data, headers=None):
+    """Build a mock streaming requests response yielding the given bytes."""
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = headers or {}
+    resp.__enter__.return_value = resp
+    resp.iter_content.return_value = [data]
+    return resp
+
+
+def test_http_get_head_or_download_skips_transfer_on_304(tmp_path):
+    """A 304 answer to the conditional HEAD should keep the existing copy."""
+    target_path = tmp_path / "photo.jpg"
+    target_path.write_bytes(b"cached-bytes")
+    (tmp_path / "photo.jpg.meta").write_text(
+        json.dumps({"etag": '"abc123"', "last_modified": None, "size": 12}),
+        encoding="utf-8",
+    )
+
+    head_resp = MagicMock()
+    head_resp.status_code = 304
+    with (
+        patch("requests.Session.head", return_value=head_resp) as mock_head,
+        patch("requests.Session.get") as mock_get,
+    ):
+        result = http_get_head_or_download(
+            url="https://example.com/private/photo.jpg",
+            headers={"x-api-key": "test_key"},
+            target_path=target_path,
+        )
+
+    assert result is True
+    mock_get.assert_not_called()
+    # the stored ETag must have been sent for revalidation
+    assert mock_head.call_args[1]["headers"]["If-None-Match"] == '"abc123"'
+    assert target_path.read_bytes() == b"cached-bytes"
+
+
+def test_http_get_head_or_download_trusts_matching_content_length(tmp_path):
+    """Without a .meta sidecar, a matching Content-Length skips the transfer."""
+    target_path = tmp_path / "photo.jpg"
+    target_path.write_bytes(b"cached-bytes")
+
+    head_resp = MagicMock()
+    head_resp.status_code = 200
+    head_resp.headers = {"Content-Length": "12"}
+    with (
+        patch("requests.Session.head", return_value=head_resp),
+        patch("requests.Session.get") as mock_get,
+    ):
+        result = http_get_head_or_download(
+            url="https://example.com/private/photo.jpg",
+            headers={"x-api-key": "test_key"},
+            target_path=target_path,
+        )
+
+    assert result is True
+    mock_get.assert_not_called()
+    assert target_path.read_bytes() == b"cached-bytes"
+
+
+def test_http_get_head_or_download_redownloads_stale_copy(tmp_path):
+    """A non-304 HEAD means the copy is stale: re-download and refresh meta."""
+    target_path = tmp_path / "photo.jpg"
+    target_path.write_bytes(b"stale-bytes")
+    meta_path = tmp_path / "photo.jpg.meta"
+    meta_path.write_text(
+        json.dumps({"etag": '"old"', "last_modified": None, "size": 11}),
+        encoding="utf-8",
+    )
+
+    head_resp = MagicMock()
+    head_resp.status_code = 200
+    get_resp = make_stream_response(b"fresh-bytes!", headers={"ETag": '"new"'})
+    with (
+        patch("requests.Session.head", return_value=head_resp),
+        patch("requests.Session.get", return_value=get_resp) as mock_get,
+    ):
+        result = http_get_head_or_download(
+            url="https://example.com/private/photo.jpg",
+            headers={"x-api-key": "test_key"},
+            target_path=target_path,
+        )
+
+    assert result is True
+    assert mock_get.call_count == 1
+    assert target_path.read_bytes() == b"fresh-bytes!"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    assert meta["etag"] == '"new"'
+    assert meta["size"] == len(b"fresh-bytes!")
+
+
 def test_http_get_head_or_download_cleans_up_on_failure(tmp_path):
     """Test that http_get_head_or_download removes partial files on download failure."""
     target_path = tmp_path / "failed_download.pdf"
 
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_urlopen.side_effect = Exception("network error")
+    with patch("requests.Session.get") as mock_get:
+        mock_get.side_effect = Exception("network error")
 
         result = http_get_head_or_download(
             url="https://example.com/private/file.pdf",